@@ -4,18 +4,40 @@ Coordinates the evaluation of different LLM models for JML annotation generation
 """
 
 import os
+import io
+import csv
 import json
+import atexit
+import hashlib
+import shutil
+import tempfile
 import time
-import matplotlib.pyplot as plt
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; stdlib json works everywhere
+    orjson = None
 import pandas as pd
 import numpy as np
-import seaborn as sns
-from tqdm import tqdm
+from tqdm.asyncio import tqdm as atqdm
 from pathlib import Path
 from datetime import datetime
 from typing import Dict, List, Tuple, Any
 
 from llm_interface import LLMInterface
+
+# Bounds on the retry feedback sent back to the LLM; verbose tool output
+# would otherwise balloon the prompt (and its latency) on every retry
+MAX_FEEDBACK_LINES = 50
+MAX_FEEDBACK_CHARS = 4000
+
+# Wall-time cap per verification tool, matching KeYVerifier's subprocess timeout
+VERIFICATION_TIMEOUT = 60
+from llm_cache import CachedLLM
 from ollama_client import OllamaClient
 from JMLGenerator import JMLGenerator
 from SpotBugsAnalyzer import SpotBugsAnalyzer
@@ -27,11 +49,13 @@ class JMLResearchEvaluator:
     Coordinates the evaluation of different LLM models for JML annotation generation.
     """
 
-    def __init__(self, 
+    def __init__(self,
                  models: List[Dict[str, Any]],
                  test_cases_dir: str = "test_cases",
                  output_dir: str = "results",
-                 max_retries: int = 3):
+                 max_retries: int = 3,
+                 max_parallel: int = 4,
+                 generate_graphs: bool = True):
         """
         Initialize the JML research evaluator.
 
@@ -40,18 +64,65 @@ class JMLResearchEvaluator:
             test_cases_dir: Directory containing Java test cases
             output_dir: Directory to store results
             max_retries: Maximum number of retries for generation
+            max_parallel: Maximum number of (model, test case) evaluations in flight
+            generate_graphs: Whether to render the visualization graphs
         """
         self.models = models
         self.test_cases_dir = test_cases_dir
         self.output_dir = output_dir
         self.max_retries = max_retries
+        self.max_parallel = max_parallel
+        self.generate_graphs = generate_graphs
+
+        # Directories and the run timestamp are computed once here instead of
+        # per call in the save/graph helpers
+        self.data_dir = os.path.join(output_dir, "data")
+        self.graph_dir = os.path.join(output_dir, "graphs")
+        self.run_timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
 
         # Ensure directories exist
         os.makedirs(test_cases_dir, exist_ok=True)
         os.makedirs(output_dir, exist_ok=True)
         os.makedirs(os.path.join(output_dir, "code"), exist_ok=True)
-        os.makedirs(os.path.join(output_dir, "data"), exist_ok=True)
-        os.makedirs(os.path.join(output_dir, "graphs"), exist_ok=True)
+        os.makedirs(self.data_dir, exist_ok=True)
+        os.makedirs(self.graph_dir, exist_ok=True)
+
+        # Clients, generators, and analyzers are built once and reused for
+        # every (model, test case) pair; recreating them per evaluation would
+        # repay config parsing and drop HTTP connection reuse, and the
+        # analyzers are stateless anyway
+        self._clients = {model["name"]: self._create_llm_client(model) for model in models}
+        self._generators = {name: JMLGenerator(client) for name, client in self._clients.items()}
+        self._spotbugs = SpotBugsAnalyzer()
+        self._key_verifier = KeYVerifier()
+
+        # Test cases are loaded lazily and memoized
+        self._test_cases = None
+
+        # Scratch directory holding the candidate files handed to SpotBugs
+        # and KeY; per-candidate subdirs keep concurrent evaluations apart
+        self._workdir = tempfile.mkdtemp(prefix="jmleval_")
+        atexit.register(shutil.rmtree, self._workdir, ignore_errors=True)
+
+        # Per-(model, test case) outcome arrays, allocated once the test
+        # cases are known; aggregation then becomes a few vectorized means
+        # instead of per-result Python counter updates
+        self._model_index = {}
+        self._case_index = {}
+        self._flags = None
+        self._retries = None
+        self._times = None
+
+        # Completed results are streamed to a JSONL file as they arrive so a
+        # crashed run keeps everything finished so far
+        self._results_file = None
+        self._results_lock = threading.Lock()
+
+        # Whole-evaluation memo for deterministic (temperature == 0) runs,
+        # persisted across processes: re-running a sweep after adding one
+        # test case or model only pays for the new pairs
+        self._eval_cache_path = os.path.join(output_dir, "eval_cache.json")
+        self._eval_cache = self._load_eval_cache()
 
         # Results storage
         self.results = {
@@ -65,17 +136,28 @@ class JMLResearchEvaluator:
         """
         Load all Java test cases from the test cases directory.
 
+        The loaded list is memoized so repeated run_evaluation calls don't
+        re-read the files from disk.
+
         Returns:
             List of test case objects with name and code
         """
-        test_cases = []
+        if self._test_cases is not None:
+            return self._test_cases
+
+        # os.scandir avoids the per-entry stat that Path.glob pays, and the
+        # reads go through a thread pool so large corpora aren't serial I/O
+        with os.scandir(self.test_cases_dir) as entries:
+            java_paths = sorted(
+                (Path(entry.path) for entry in entries
+                 if entry.is_file() and entry.name.endswith(".java")),
+            )
 
-        for file_path in Path(self.test_cases_dir).glob("*.java"):
-            with open(file_path, "r") as f:
-                test_cases.append({
-                    "name": file_path.stem,
-                    "code": f.read()
-                })
+        with ThreadPoolExecutor() as pool:
+            test_cases = list(pool.map(
+                lambda path: {"name": path.stem, "code": path.read_text(encoding="utf-8")},
+                java_paths
+            ))
 
         if not test_cases:
             # Add a sample test case if none exist
@@ -107,17 +189,34 @@ public class Calculator {
             with open(os.path.join(self.test_cases_dir, f"{sample_case['name']}.java"), "w") as f:
                 f.write(sample_case["code"])
 
+        self._test_cases = test_cases
         return test_cases
 
-    def run_evaluation(self):
+    async def run_evaluation(self):
         """
         Run the full evaluation process for all models and test cases.
+
+        All (model, test case) combinations are evaluated concurrently, bounded
+        by a semaphore of size `max_parallel`. The work is I/O-bound (HTTP to
+        Ollama, subprocess calls to the Java tools), so fanning out overlaps
+        the round-trip latencies instead of summing them.
         """
         test_cases = self.load_test_cases()
         self.results["test_cases"] = [case["name"] for case in test_cases]
 
         print(f"🔍 Evaluating {len(self.models)} models on {len(test_cases)} test cases")
 
+        # Allocate the outcome arrays now that the shapes are known
+        shape = (len(self.models), len(test_cases))
+        self._model_index = {model["name"]: i for i, model in enumerate(self.models)}
+        self._case_index = {case["name"]: j for j, case in enumerate(test_cases)}
+        self._flags = {
+            key: np.zeros(shape, np.uint8)
+            for key in ("success", "compile_success", "spotbugs_success", "key_success")
+        }
+        self._retries = np.zeros(shape)
+        self._times = np.zeros(shape)
+
         # Set up tracking metrics for each model
         for model in self.models:
             model_name = model["name"]
@@ -131,49 +230,30 @@ public class Calculator {
                 "test_results": {}
             }
 
-        # Evaluate each test case with each model
-        for test_case in tqdm(test_cases, desc="Processing test cases"):
-            for model_config in self.models:
-                model_name = model_config["name"]
-                print(f"\n📊 Testing {model_name} on {test_case['name']}")
-
-                try:
-                    # Initialize LLM client based on model config
-                    llm = self._create_llm_client(model_config)
-
-                    # Create verification system
-                    spotbugs = SpotBugsAnalyzer()
-                    key_verifier = KeYVerifier()
-                    jml_generator = JMLGenerator(llm)
+        # Evaluate each (test case, model) pair concurrently
+        semaphore = asyncio.Semaphore(self.max_parallel)
 
-                    # Measure execution time
-                    start_time = time.time()
+        async def bounded_evaluate(test_case, model_config):
+            async with semaphore:
+                await self._evaluate_pair(test_case, model_config)
 
-                    # Run the evaluation
-                    test_result = self._evaluate_single_case(
-                        test_case["code"], 
-                        test_case["name"],
-                        jml_generator, 
-                        spotbugs, 
-                        key_verifier
-                    )
+        tasks = [
+            bounded_evaluate(test_case, model_config)
+            for test_case in test_cases
+            for model_config in self.models
+        ]
 
-                    # Record execution time
-                    execution_time = time.time() - start_time
-                    test_result["execution_time"] = execution_time
+        jsonl_path = os.path.join(self.data_dir, f"evaluation_results_{self.run_timestamp}.jsonl")
+        with open(jsonl_path, "ab") as self._results_file:
+            # tqdm's asyncio gather keeps the tasks on the event loop and
+            # rate-limits bar redraws, so progress rendering never competes
+            # with the evaluations for the loop
+            await atqdm.gather(*tasks, desc="Processing evaluations",
+                               total=len(tasks), mininterval=0.5)
+        self._results_file = None
 
-                    # Store the results
-                    self.results["metrics"][model_name]["test_results"][test_case["name"]] = test_result
-
-                    # Update aggregate metrics
-                    self._update_metrics(model_name, test_result)
-
-                except Exception as e:
-                    print(f"❌ Error evaluating {model_name} on {test_case['name']}: {str(e)}")
-                    self.results["metrics"][model_name]["test_results"][test_case["name"]] = {
-                        "error": str(e),
-                        "success": False
-                    }
+        # Persist the deterministic-run memo for future sweeps
+        self._save_eval_cache()
 
         # Finalize the aggregate metrics
         self._finalize_metrics()
@@ -186,6 +266,131 @@ public class Calculator {
 
         print("\n✅ Evaluation complete! Results saved to", self.output_dir)
 
+    async def _evaluate_pair(self, test_case: Dict[str, str], model_config: Dict[str, Any]):
+        """
+        Evaluate one (test case, model) combination and record its results.
+
+        Args:
+            test_case: Test case object with name and code
+            model_config: Configuration for the model
+        """
+        model_name = model_config["name"]
+        print(f"\n📊 Testing {model_name} on {test_case['name']}")
+
+        cache_key = self._eval_cache_key(model_config, test_case["code"])
+        if cache_key is not None and cache_key in self._eval_cache:
+            print(f"♻️ Reusing cached evaluation for {model_name} on {test_case['name']}")
+            test_result = self._eval_cache[cache_key]
+            self.results["metrics"][model_name]["test_results"][test_case["name"]] = test_result
+            self._update_metrics(model_name, test_case["name"], test_result)
+            self._append_result(model_name, test_case["name"], test_result)
+            return
+
+        try:
+            # Reuse the shared verification components for this model
+            spotbugs = self._spotbugs
+            key_verifier = self._key_verifier
+            jml_generator = self._generators[model_name]
+
+            # Measure execution time
+            start_time = time.time()
+
+            # Run the evaluation
+            test_result = await self._evaluate_single_case(
+                test_case["code"],
+                test_case["name"],
+                jml_generator,
+                spotbugs,
+                key_verifier
+            )
+
+            # Record execution time
+            execution_time = time.time() - start_time
+            test_result["execution_time"] = execution_time
+
+            # Store the results
+            self.results["metrics"][model_name]["test_results"][test_case["name"]] = test_result
+
+            # Update aggregate metrics
+            self._update_metrics(model_name, test_case["name"], test_result)
+
+            if cache_key is not None:
+                self._eval_cache[cache_key] = test_result
+
+        except Exception as e:
+            print(f"❌ Error evaluating {model_name} on {test_case['name']}: {str(e)}")
+            test_result = {"error": str(e), "success": False}
+            self.results["metrics"][model_name]["test_results"][test_case["name"]] = test_result
+
+        self._append_result(model_name, test_case["name"], test_result)
+
+    def _eval_cache_key(self, model_config: Dict[str, Any], java_code: str):
+        """
+        Return the evaluation memo key for a (model, test case) pair.
+
+        Only deterministic configurations (temperature == 0) are cacheable;
+        for sampled runs repeating the evaluation is the point.
+
+        Args:
+            model_config: Configuration for the model
+            java_code: Source code of the test case
+
+        Returns:
+            A hex digest key, or None when the pair must not be memoized
+        """
+        temperature = model_config.get("temperature", 0.7)
+        if temperature is None or temperature > 0:
+            return None
+        payload = f"{model_config['name']}\x00{temperature}\x00{java_code}"
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def _load_eval_cache(self) -> Dict[str, Any]:
+        """Load the persisted evaluation memo, or start empty."""
+        try:
+            with open(self._eval_cache_path, "rb") as f:
+                data = f.read()
+            return orjson.loads(data) if orjson is not None else json.loads(data)
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            print(f"Warning: Failed to load evaluation cache: {e}")
+            return {}
+
+    def _save_eval_cache(self):
+        """Persist the evaluation memo for future runs."""
+        if not self._eval_cache:
+            return
+        try:
+            if orjson is not None:
+                Path(self._eval_cache_path).write_bytes(orjson.dumps(self._eval_cache))
+            else:
+                with open(self._eval_cache_path, "w") as f:
+                    json.dump(self._eval_cache, f)
+        except Exception as e:
+            print(f"Warning: Failed to save evaluation cache: {e}")
+
+    def _append_result(self, model_name: str, case_name: str, test_result: Dict[str, Any]):
+        """
+        Append one completed (model, test case) result to the run's JSONL file.
+
+        Args:
+            model_name: Name of the model
+            case_name: Name of the test case
+            test_result: Results from the evaluation
+        """
+        if self._results_file is None:
+            return
+
+        record = {"model": model_name, "test_case": case_name, "result": test_result}
+        if orjson is not None:
+            line = orjson.dumps(record)
+        else:
+            line = json.dumps(record).encode()
+
+        with self._results_lock:
+            self._results_file.write(line + b"\n")
+            self._results_file.flush()
+
     def _create_llm_client(self, model_config: Dict[str, Any]) -> LLMInterface:
         """
         Create an LLM client based on model configuration.
@@ -199,20 +404,25 @@ public class Calculator {
         client_type = model_config.get("client_type", "ollama")
 
         if client_type == "ollama":
-            return OllamaClient(
+            # CachedLLM below already memoizes per (code, feedback), so the
+            # client's own sqlite response cache would only duplicate it
+            client = OllamaClient(
                 model=model_config["model_name"],
                 base_url=model_config.get("base_url", "http://localhost:11434"),
-                temperature=model_config.get("temperature", 0.7)
+                temperature=model_config.get("temperature", 0.7),
+                use_cache=False
             )
         else:
             raise ValueError(f"Unsupported client type: {client_type}")
 
-    def _evaluate_single_case(self, 
-                              java_code: str, 
-                              case_name: str,
-                              jml_generator: JMLGenerator, 
-                              spotbugs: SpotBugsAnalyzer, 
-                              key_verifier: KeYVerifier) -> Dict[str, Any]:
+        return CachedLLM(client, cache_dir=os.path.join(self.output_dir, "cache"))
+
+    async def _evaluate_single_case(self,
+                                    java_code: str,
+                                    case_name: str,
+                                    jml_generator: JMLGenerator,
+                                    spotbugs: SpotBugsAnalyzer,
+                                    key_verifier: KeYVerifier) -> Dict[str, Any]:
         """
         Evaluate a single test case with a specific model.
 
@@ -232,7 +442,8 @@ public class Calculator {
             "spotbugs_success": False,
             "key_success": False,
             "retries": 0,
-            "annotations": None,
+            "annotations_hash": None,
+            "annotations_path": None,
             "errors": [],
             "class_name": None
         }
@@ -251,34 +462,58 @@ public class Calculator {
             result["retries"] = attempt + 1
 
             try:
-                annotated_code = jml_generator.generate_and_validate(current_code, feedback)
+                annotated_code = await jml_generator.generate_and_validate_async(current_code, feedback)
                 result["compile_success"] = True
-                result["annotations"] = annotated_code
 
-                # Save the annotated code
-                code_file_path = os.path.join(
-                    self.output_dir, 
-                    "code", 
-                    f"{case_name}_{result['class_name']}.java"
-                )
-                with open(code_file_path, "w") as f:
+                # Save the annotated code content-addressed; identical output
+                # across models or attempts dedupes to a single file, and the
+                # results JSON only carries the hash and path
+                code_hash = hashlib.sha256(annotated_code.encode()).hexdigest()[:16]
+                code_file_path = os.path.join(self.output_dir, "code", f"{code_hash}.java")
+                try:
+                    fd = os.open(code_file_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL)
+                except FileExistsError:
+                    pass  # identical content is already stored
+                else:
+                    with os.fdopen(fd, "w") as f:
+                        f.write(annotated_code)
+                result["annotations_hash"] = code_hash
+                result["annotations_path"] = code_file_path
+
+                # Write the candidate into a scratch subdir (keyed by content
+                # hash, so concurrent evaluations never share a path) — this
+                # is the file the analyzers actually read
+                scratch_dir = os.path.join(self._workdir, code_hash)
+                os.makedirs(scratch_dir, exist_ok=True)
+                file_path = os.path.join(scratch_dir, f"{result['class_name']}.java")
+                with open(file_path, "w") as f:
                     f.write(annotated_code)
 
-                # Check with SpotBugs
-                file_path = f"{result['class_name']}.java"
-                spotbugs_errors = spotbugs.run(file_path)
+                # Check with SpotBugs and KeY concurrently; both are
+                # independent subprocess-bound analyses of the same file, so
+                # this attempt costs max(spotbugs, key) instead of the sum
+                spotbugs_task = asyncio.create_task(spotbugs.run_async(file_path))
+                key_task = asyncio.create_task(key_verifier.verify_async(file_path))
+
+                try:
+                    spotbugs_errors = await asyncio.wait_for(
+                        spotbugs_task, timeout=VERIFICATION_TIMEOUT)
+                except asyncio.TimeoutError:
+                    spotbugs_errors = ["SpotBugs analysis timed out"]
                 if not spotbugs_errors:
                     result["spotbugs_success"] = True
                 else:
                     result["errors"].append({"type": "spotbugs", "messages": spotbugs_errors})
 
-                # Check with KeY verifier
                 try:
-                    key_result = key_verifier.verify(file_path)
+                    key_result = await asyncio.wait_for(
+                        key_task, timeout=VERIFICATION_TIMEOUT)
                     if key_result["success"]:
                         result["key_success"] = True
                     else:
                         result["errors"].append({"type": "key", "messages": key_result["errors"]})
+                except asyncio.TimeoutError:
+                    result["errors"].append({"type": "key", "messages": ["KeY verification timed out"]})
                 except Exception as e:
                     print(f"Warning: KeY verification failed with error: {str(e)}")
                     result["errors"].append({"type": "key", "messages": [str(e)]})
@@ -295,12 +530,10 @@ public class Calculator {
                     break
 
                 # Build feedback for next attempt
-                feedback = "Issues found:\n"
-                if spotbugs_errors:
-                    feedback += "- SpotBugs errors:\n" + "\n".join(spotbugs_errors) + "\n"
+                key_errors = []
                 if not result["key_success"]:
                     key_errors = result["errors"][-1]["messages"] if result["errors"] else []
-                    feedback += "- KeY errors:\n" + "\n".join(key_errors) + "\n"
+                feedback = self._build_feedback(spotbugs_errors, key_errors)
 
                 current_code = annotated_code
 
@@ -315,50 +548,78 @@ public class Calculator {
 
         return result
 
-    def _update_metrics(self, model_name: str, test_result: Dict[str, Any]):
+    def _build_feedback(self, spotbugs_errors: List[str], key_errors: List[str]) -> str:
         """
-        Update the aggregate metrics for a model with a new test result.
+        Format tool errors into a bounded feedback prompt for the next retry.
+
+        Error lines are deduplicated (order-preserving) and capped, both per
+        tool and in total size, since the LLM only needs the signal, not the
+        full verifier transcript.
+
+        Args:
+            spotbugs_errors: Error messages reported by SpotBugs
+            key_errors: Error messages reported by KeY
+
+        Returns:
+            Feedback text for the next generation attempt
+        """
+        buffer = io.StringIO()
+        buffer.write("Issues found:\n")
+
+        if spotbugs_errors:
+            buffer.write("- SpotBugs errors:\n")
+            buffer.write("\n".join(islice(dict.fromkeys(spotbugs_errors), MAX_FEEDBACK_LINES)))
+            buffer.write("\n")
+        if key_errors:
+            buffer.write("- KeY errors:\n")
+            buffer.write("\n".join(islice(dict.fromkeys(key_errors), MAX_FEEDBACK_LINES)))
+            buffer.write("\n")
+
+        return buffer.getvalue()[:MAX_FEEDBACK_CHARS]
+
+    def _update_metrics(self, model_name: str, case_name: str, test_result: Dict[str, Any]):
+        """
+        Record one test result in the per-(model, test case) outcome arrays.
 
         Args:
             model_name: Name of the model
+            case_name: Name of the test case
             test_result: Results from a single test case evaluation
         """
-        metrics = self.results["metrics"][model_name]
-
-        # Increment counters
-        if test_result.get("success", False):
-            metrics["success_rate"] += 1
-        if test_result.get("compile_success", False):
-            metrics["compile_success"] += 1
-        if test_result.get("spotbugs_success", False):
-            metrics["spotbugs_success"] += 1
-        if test_result.get("key_success", False):
-            metrics["key_success"] += 1
-
-        # Track retries and execution time
-        metrics["avg_retries"] += test_result.get("retries", 0)
-        metrics["execution_time"] += test_result.get("execution_time", 0)
+        i = self._model_index[model_name]
+        j = self._case_index[case_name]
+        get = test_result.get
+
+        for key, flags in self._flags.items():
+            flags[i, j] = bool(get(key, False))
+
+        self._retries[i, j] = get("retries", 0)
+        self._times[i, j] = get("execution_time", 0)
 
     def _finalize_metrics(self):
         """
         Finalize the aggregate metrics by computing averages.
         """
         test_count = len(self.results["test_cases"])
-        if test_count == 0:
+        if test_count == 0 or self._flags is None:
             return
 
-        for model_name, metrics in self.results["metrics"].items():
-            # Convert counters to percentages
-            metrics["success_rate"] = (metrics["success_rate"] / test_count) * 100
-            metrics["compile_success"] = (metrics["compile_success"] / test_count) * 100
-            metrics["spotbugs_success"] = (metrics["spotbugs_success"] / test_count) * 100
-            metrics["key_success"] = (metrics["key_success"] / test_count) * 100
-
-            # Compute average retries
-            metrics["avg_retries"] = metrics["avg_retries"] / test_count
-
-            # Average execution time
-            metrics["avg_execution_time"] = metrics["execution_time"] / test_count
+        # One vectorized reduction per metric over the outcome arrays
+        rates = {key: flags.mean(axis=1) * 100 for key, flags in self._flags.items()}
+        avg_retries = self._retries.mean(axis=1)
+        total_times = self._times.sum(axis=1)
+
+        for model_name, i in self._model_index.items():
+            metrics = self.results["metrics"][model_name]
+            metrics.update({
+                "success_rate": float(rates["success"][i]),
+                "compile_success": float(rates["compile_success"][i]),
+                "spotbugs_success": float(rates["spotbugs_success"][i]),
+                "key_success": float(rates["key_success"][i]),
+                "avg_retries": float(avg_retries[i]),
+                "execution_time": float(total_times[i]),
+                "avg_execution_time": float(total_times[i] / test_count)
+            })
 
             print(f"\n📊 {model_name} Results:")
             print(f"  Success Rate: {metrics['success_rate']:.2f}%")
@@ -372,37 +633,77 @@ public class Calculator {
         """
         Save evaluation results to disk in JSON format.
         """
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        results_path = os.path.join(self.output_dir, "data", f"evaluation_results_{timestamp}.json")
-
-        with open(results_path, "w") as f:
-            json.dump(self.results, f, indent=2)
-
-        # Also save a CSV version for easy import into other tools
-        csv_data = []
-        for model_name, metrics in self.results["metrics"].items():
-            for test_case in self.results["test_cases"]:
-                test_result = metrics["test_results"].get(test_case, {})
-                row = {
-                    "model": model_name,
-                    "test_case": test_case,
-                    "success": test_result.get("success", False),
-                    "compile_success": test_result.get("compile_success", False),
-                    "spotbugs_success": test_result.get("spotbugs_success", False),
-                    "key_success": test_result.get("key_success", False),
-                    "retries": test_result.get("retries", 0),
-                    "execution_time": test_result.get("execution_time", 0)
-                }
-                csv_data.append(row)
-
-        df = pd.DataFrame(csv_data)
-        csv_path = os.path.join(self.output_dir, "data", f"evaluation_results_{timestamp}.csv")
-        df.to_csv(csv_path, index=False)
+        timestamp = self.run_timestamp
+        results_path = os.path.join(self.data_dir, f"evaluation_results_{timestamp}.json")
+
+        if orjson is not None:
+            Path(results_path).write_bytes(
+                orjson.dumps(self.results, option=orjson.OPT_INDENT_2))
+        else:
+            with open(results_path, "w") as f:
+                json.dump(self.results, f, indent=2)
+
+        # Also save a CSV version for easy import into other tools; the rows
+        # go straight through csv.DictWriter, skipping pandas dtype inference
+        # and object overhead for what is plain string formatting
+        fieldnames = ["model", "test_case", "success", "compile_success",
+                      "spotbugs_success", "key_success", "retries", "execution_time"]
+        rows = [
+            {
+                "model": model_name,
+                "test_case": case_name,
+                "success": test_result.get("success", False),
+                "compile_success": test_result.get("compile_success", False),
+                "spotbugs_success": test_result.get("spotbugs_success", False),
+                "key_success": test_result.get("key_success", False),
+                "retries": test_result.get("retries", 0),
+                "execution_time": test_result.get("execution_time", 0)
+            }
+            for model_name, metrics in self.results["metrics"].items()
+            for case_name, test_result in metrics["test_results"].items()
+        ]
+
+        csv_path = os.path.join(self.data_dir, f"evaluation_results_{timestamp}.csv")
+        with open(csv_path, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=fieldnames)
+            writer.writeheader()
+            writer.writerows(rows)
+
+        # Parquet sidecar: much faster to write and far smaller than CSV on
+        # large sweeps, and Arrow-native for downstream analysis
+        try:
+            df = pd.DataFrame.from_records(rows, columns=fieldnames).astype(
+                {"retries": "int16", "execution_time": "float32"})
+            parquet_path = os.path.join(self.data_dir, f"evaluation_results_{timestamp}.parquet")
+            df.to_parquet(parquet_path, engine="pyarrow", compression="zstd")
+        except Exception as e:
+            print(f"Warning: Failed to write parquet results: {e}")
 
     def _generate_graphs(self):
         """
         Generate comprehensive visualization graphs based on the evaluation results.
         """
+        if not self.generate_graphs:
+            return
+
+        # Nothing worth rendering: no data, or a single model on a single
+        # test case, where every panel collapses to one bar. Bailing out here
+        # also skips the matplotlib import entirely.
+        if not self.results["test_cases"]:
+            print("Skipping graphs: no test cases were evaluated")
+            return
+        if len(self.results["metrics"]) < 2 and len(self.results["test_cases"]) < 2:
+            print("Skipping graphs: single model on a single test case")
+            return
+
+        # matplotlib/seaborn import slowly and allocate tens of MB, so they
+        # are only pulled in when graphs are actually wanted; the Agg backend
+        # skips GUI backend probing on headless machines
+        import matplotlib
+        matplotlib.use("Agg")
+        import matplotlib.pyplot as plt
+        import seaborn as sns
+
         # Prepare data for plotting
         models = list(self.results["metrics"].keys())
         success_rates = [self.results["metrics"][model]["success_rate"] for model in models]
@@ -418,55 +719,53 @@ public class Calculator {
 
         # Set up the style
         plt.style.use("ggplot")
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        graph_dir = os.path.join(self.output_dir, "graphs")
-        os.makedirs(graph_dir, exist_ok=True)
-
-        # 1. Success Rate Comparison
-        plt.figure(figsize=(12, 8))
-        df = pd.DataFrame({
-            "Model": models * 4,
-            "Success Rate (%)": success_rates + compile_rates + spotbugs_rates + key_rates,
-            "Metric": (["Overall Success"] * len(models) + 
-                ["Compilation"] * len(models) + 
-                ["SpotBugs"] * len(models) + 
-                ["KeY Verification"] * len(models))
-        })
-
-        chart = sns.barplot(x="Model", y="Success Rate (%)", hue="Metric", data=df)
-        chart.set_title("Success Rates by Model and Verification Method", fontsize=16)
-        chart.set_ylim(0, 100)
-        plt.xticks(rotation=45, ha="right")
-        plt.tight_layout()
-        plt.savefig(os.path.join(graph_dir, f"success_rates_{timestamp}.png"), dpi=300)
+        timestamp = self.run_timestamp
+        graph_dir = self.graph_dir
+
+        # All panels share one figure and one render pass instead of six
+        # separate figure/savefig cycles
+        fig = plt.figure(figsize=(20, 24))
+        grid = fig.add_gridspec(3, 2)
+
+        # 1. Success Rate Comparison; build the long-form frame with one
+        # NumPy stack + melt instead of Python list multiplication
+        ax = fig.add_subplot(grid[0, 0])
+        rate_matrix = np.array([success_rates, compile_rates, spotbugs_rates, key_rates])
+        df = pd.DataFrame(
+            rate_matrix.T,
+            index=pd.Index(models, name="Model"),
+            columns=["Overall Success", "Compilation", "SpotBugs", "KeY Verification"]
+        ).reset_index().melt(id_vars="Model", var_name="Metric",
+                             value_name="Success Rate (%)")
+
+        sns.barplot(x="Model", y="Success Rate (%)", hue="Metric", data=df, ax=ax)
+        ax.set_title("Success Rates by Model and Verification Method", fontsize=16)
+        ax.set_ylim(0, 100)
+        plt.setp(ax.get_xticklabels(), rotation=45, ha="right")
 
         # 2. Average Retries
-        plt.figure(figsize=(10, 6))
-        ax = sns.barplot(x=models, y=avg_retries, palette="Blues_d")
+        ax = fig.add_subplot(grid[0, 1])
+        sns.barplot(x=models, y=avg_retries, palette="Blues_d", ax=ax)
         for i, value in enumerate(avg_retries):
             ax.text(i, value + 0.1, f"{value:.2f}", ha="center", fontsize=10)
-        plt.title("Average Retries by Model", fontsize=16)
-        plt.xlabel("Model", fontsize=12)
-        plt.ylabel("Average Retries", fontsize=12)
-        plt.xticks(rotation=45, ha="right")
-        plt.tight_layout()
-        plt.savefig(os.path.join(graph_dir, f"avg_retries_{timestamp}.png"), dpi=300)
+        ax.set_title("Average Retries by Model", fontsize=16)
+        ax.set_xlabel("Model", fontsize=12)
+        ax.set_ylabel("Average Retries", fontsize=12)
+        plt.setp(ax.get_xticklabels(), rotation=45, ha="right")
 
         # 3. Average Execution Time
-        plt.figure(figsize=(10, 6))
-        ax = sns.barplot(x=models, y=avg_times, palette="Greens_d")
+        ax = fig.add_subplot(grid[1, 0])
+        sns.barplot(x=models, y=avg_times, palette="Greens_d", ax=ax)
         for i, value in enumerate(avg_times):
             ax.text(i, value + 0.5, f"{value:.2f}s", ha="center", fontsize=10)
-        plt.title("Average Execution Time by Model", fontsize=16)
-        plt.xlabel("Model", fontsize=12)
-        plt.ylabel("Time (seconds)", fontsize=12)
-        plt.xticks(rotation=45, ha="right")
-        plt.tight_layout()
-        plt.savefig(os.path.join(graph_dir, f"execution_time_{timestamp}.png"), dpi=300)
+        ax.set_title("Average Execution Time by Model", fontsize=16)
+        ax.set_xlabel("Model", fontsize=12)
+        ax.set_ylabel("Time (seconds)", fontsize=12)
+        plt.setp(ax.get_xticklabels(), rotation=45, ha="right")
 
         # 4. Success Rate Radar Chart
         if len(models) > 1:
-            plt.figure(figsize=(10, 8))
+            ax = fig.add_subplot(grid[1, 1], polar=True)
 
             # Create radar chart categories and values
             categories = ['Overall', 'Compilation', 'SpotBugs', 'KeY']
@@ -476,9 +775,6 @@ public class Calculator {
             angles = [n / float(N) * 2 * np.pi for n in range(N)]
             angles += angles[:1]  # Close the loop
 
-            # Initialize subplot
-            ax = plt.subplot(111, polar=True)
-
             # Add each model as a line on the chart
             for i, model in enumerate(models):
                 values = [
@@ -493,19 +789,16 @@ public class Calculator {
                 ax.plot(angles, values, linewidth=2, linestyle='solid', label=model)
                 ax.fill(angles, values, alpha=0.1)
 
-            # Set category labels
-            plt.xticks(angles[:-1], categories)
-
-            # Set radial limits
-            plt.yticks([20, 40, 60, 80, 100], ['20%', '40%', '60%', '80%', '100%'], color='grey', size=10)
-            plt.ylim(0, 100)
+            # Set category labels and radial limits
+            ax.set_xticks(angles[:-1])
+            ax.set_xticklabels(categories)
+            ax.set_yticks([20, 40, 60, 80, 100])
+            ax.set_yticklabels(['20%', '40%', '60%', '80%', '100%'], color='grey', size=10)
+            ax.set_ylim(0, 100)
 
             # Add legend and title
-            plt.legend(loc='upper right', bbox_to_anchor=(0.1, 0.1))
-            plt.title('Success Metrics Comparison by Model', size=20, y=1.1)
-
-            plt.tight_layout()
-            plt.savefig(os.path.join(graph_dir, f"radar_chart_{timestamp}.png"), dpi=300)
+            ax.legend(loc='upper right', bbox_to_anchor=(0.1, 0.1))
+            ax.set_title('Success Metrics Comparison by Model', size=20, y=1.1)
 
         # 5. Detailed breakdown by test case (if we have multiple test cases)
         if len(self.results["test_cases"]) > 1:
@@ -520,28 +813,30 @@ public class Calculator {
                         "Success": 100 if test_result.get("success", False) else 0
                     })
 
-            df_test_cases = pd.DataFrame(test_case_data)
+            df_test_cases = pd.DataFrame.from_records(test_case_data)
 
-            plt.figure(figsize=(14, 8))
-            chart = sns.barplot(x="Test Case", y="Success", hue="Model", data=df_test_cases)
-            chart.set_title("Success by Test Case and Model", fontsize=16)
-            chart.set_ylim(0, 100)
-            plt.xticks(rotation=45, ha="right")
-            plt.tight_layout()
-            plt.savefig(os.path.join(graph_dir, f"test_case_results_{timestamp}.png"), dpi=300)
+            ax = fig.add_subplot(grid[2, 0])
+            sns.barplot(x="Test Case", y="Success", hue="Model", data=df_test_cases, ax=ax)
+            ax.set_title("Success by Test Case and Model", fontsize=16)
+            ax.set_ylim(0, 100)
+            plt.setp(ax.get_xticklabels(), rotation=45, ha="right")
 
             # 6. Heatmap of success by model and test case
             success_matrix = pd.pivot_table(
-                df_test_cases, 
-                values='Success', 
-                index=['Model'], 
-                columns=['Test Case'], 
+                df_test_cases,
+                values='Success',
+                index=['Model'],
+                columns=['Test Case'],
                 aggfunc='first'
             ).fillna(0)
 
-            plt.figure(figsize=(12, 10))
-            sns.heatmap(success_matrix, annot=True, cmap="YlGnBu", fmt=".0f", 
-                        cbar_kws={'label': 'Success (%)'})
-            plt.title("Success Rate Heatmap by Model and Test Case", fontsize=16)
-            plt.tight_layout()
-            plt.savefig(os.path.join(graph_dir, f"heatmap_{timestamp}.png"), dpi=300)
+            ax = fig.add_subplot(grid[2, 1])
+            sns.heatmap(success_matrix, annot=True, cmap="YlGnBu", fmt=".0f",
+                        cbar_kws={'label': 'Success (%)'}, ax=ax)
+            ax.set_title("Success Rate Heatmap by Model and Test Case", fontsize=16)
+
+        fig.tight_layout()
+        fig.savefig(os.path.join(graph_dir, f"evaluation_summary_{timestamp}.png"), dpi=150)
+        # Drop the figure from pyplot's global registry; otherwise every run
+        # keeps its canvas (and RSS) alive for the process lifetime
+        plt.close(fig)
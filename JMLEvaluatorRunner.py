@@ -5,6 +5,7 @@ Evaluates different LLM models on their ability to generate JML annotations.
 """
 
 import argparse
+import asyncio
 import logging
 from JMLEvaluation import JMLResearchEvaluator
 
@@ -28,6 +29,10 @@ def main():
     parser.add_argument("--test-cases", type=str, default="./test_cases")
     parser.add_argument("--results", type=str, default="./results")
     parser.add_argument("--max-retries", type=int, default=3, help="Maximum number of retries for generation")
+    parser.add_argument("--concurrency", type=int, default=4,
+                        help="Maximum number of concurrent (model, test case) evaluations "
+                             "(parallel LLM decoding also needs OLLAMA_NUM_PARALLEL set "
+                             "on the Ollama server)")
     
     args = parser.parse_args()
     
@@ -38,17 +43,18 @@ def main():
             "name": model,
             "client_type": "ollama",
             "model_name": model,
-            "temperature": 0.7
+            "temperature": 0.0
         })
 
     evaluator = JMLResearchEvaluator(
         models=model_configs,
         test_cases_dir=args.test_cases,
         output_dir=args.results,
-        max_retries=args.max_retries
+        max_retries=args.max_retries,
+        max_parallel=args.concurrency
     )
 
-    evaluator.run_evaluation()
+    asyncio.run(evaluator.run_evaluation())
 
 if __name__ == "__main__":
     main()
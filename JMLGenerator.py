@@ -1,79 +1,192 @@
+import asyncio
+import atexit
+import hashlib
+import shutil
 import subprocess
 import re
 import os
 import tempfile
 from pathlib import Path
 
+from jvm_tools import SUBPROCESS_OPTS, jvm_command
+
+# Compiled once at import; _get_code_class_name runs inside the retry loop
+_CLASS_RE = re.compile(r'\b(?:public|private|protected)?\s+class\s+(\w+)')
+_ANY_CLASS_RE = re.compile(r'class\s+(\w+)')
+_BLOCK_COMMENT_RE = re.compile(r'/\*.*?\*/', re.DOTALL)
+
 class JMLGenerator:
     def __init__(self, llm):
         self.llm = llm
+        # Generation outcomes keyed by (java_code, feedback) and OpenJML
+        # verdicts keyed by annotated-code hash. Identical retries then skip
+        # the LLM round-trip and/or the JVM launch. The generation cache is
+        # only used when the LLM samples deterministically (temperature == 0);
+        # the compile cache is always safe since OpenJML is a pure function
+        # of the file contents.
+        self._generation_cache = {}
+        self._compile_cache = {}
+        # One persistent scratch directory per generator; candidate files are
+        # written into content-keyed subdirectories instead of creating and
+        # tearing down a TemporaryDirectory on every attempt
+        self._workdir = tempfile.mkdtemp(prefix="jmlgen_")
+        atexit.register(shutil.rmtree, self._workdir, ignore_errors=True)
+
+    def _candidate_path(self, annotated_code: str, class_name: str, code_hash: str) -> str:
+        """Write a candidate into the scratch dir and return its path.
+
+        The subdirectory is keyed by content hash, so concurrent validations
+        of different candidates never collide even when class names repeat.
+        """
+        case_dir = os.path.join(self._workdir, code_hash[:16])
+        os.makedirs(case_dir, exist_ok=True)
+        java_file_path = os.path.join(case_dir, f"{class_name}.java")
+        with open(java_file_path, "w") as f:
+            f.write(annotated_code)
+        return java_file_path
+
+    def _generation_cache_key(self, java_code: str, feedback: str,
+                              temperature: float = None):
+        """Return the cache key for a generation request, or None when uncacheable."""
+        if temperature is None:
+            temperature = getattr(self.llm, "temperature", None)
+        if temperature is None or temperature > 0:
+            return None
+        return hashlib.blake2b(f"{java_code}\x00{feedback}".encode()).hexdigest()
+
+    def _replay_cached_generation(self, cached: tuple) -> str:
+        """Reproduce a cached generation outcome (result or validation error)."""
+        status, payload = cached
+        if status == "error":
+            raise ValueError(payload)
+        return payload
+
+    def _build_compile_result(self, stdout: str) -> dict:
+        """Turn raw OpenJML output into a compilation result dict."""
+        print(f"Compile with openJML output: \n {stdout.lower()}")
+        success = "error" not in stdout.lower()
+        return {
+            "success": success,
+            "output": stdout,
+            "errors": [line for line in stdout.split('\n') if "error" in line.lower()]
+        }
 
     def _compile_with_openjml(self, file_path: str) -> dict:
         """Run OpenJML on the Java file and return compilation result with details."""
         result = subprocess.run(
-            ["openjml", file_path],
+            jvm_command("openjml", file_path),
             capture_output=True,
-            text=True
+            text=True,
+            **SUBPROCESS_OPTS
         )
-        print(f"Compile with openJML output: \n {result.stdout.lower()}")
-        success = "error" not in result.stdout.lower()
-        return {
-            "success": success,
-            "output": result.stdout,
-            "errors": [line for line in result.stdout.split('\n') if "error" in line.lower()]
-        }
+        return self._build_compile_result(result.stdout)
+
+    async def _compile_with_openjml_async(self, file_path: str) -> dict:
+        """Async variant of _compile_with_openjml using an asyncio subprocess."""
+        proc = await asyncio.create_subprocess_exec(
+            *jvm_command("openjml", file_path),
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            **SUBPROCESS_OPTS
+        )
+        stdout, _ = await proc.communicate()
+        return self._build_compile_result(stdout.decode())
+
+    def generate_and_validate(self, java_code: str, feedback: str = "",
+                              temperature: float = None) -> str:
+        """Generate JML annotations and validate them with OpenJML.
+
+        A per-call temperature is forwarded to the LLM client without
+        mutating it, so it stays scoped to this request.
+        """
+        cache_key = self._generation_cache_key(java_code, feedback, temperature)
+        if cache_key is not None and cache_key in self._generation_cache:
+            return self._replay_cached_generation(self._generation_cache[cache_key])
 
-    def generate_and_validate(self, java_code: str, feedback: str = "") -> str:
-        """Generate JML annotations and validate them with OpenJML."""
         # Generate annotated code
-        annotated_code = self.llm.generate_jml(java_code, feedback)
-        
+        if temperature is None:
+            annotated_code = self.llm.generate_jml(java_code, feedback)
+        else:
+            annotated_code = self.llm.generate_jml(java_code, feedback,
+                                                   temperature=temperature)
+
         # Extract class name
         class_name = self._get_code_class_name(annotated_code)
         if not class_name:
             raise ValueError("Could not extract class name from the Java code")
-        
-        # Create a temporary directory for the file
-        with tempfile.TemporaryDirectory() as temp_dir:
-            # Create Java file with the correct name matching the class
-            java_file_path = os.path.join(temp_dir, f"{class_name}.java")
-            
-            with open(java_file_path, "w") as f:
-                f.write(annotated_code)
-            
-            # Compile with OpenJML
+
+        code_hash = hashlib.blake2b(annotated_code.encode()).hexdigest()
+        result = self._compile_cache.get(code_hash)
+        if result is None:
+            # Write the candidate into the persistent scratch dir and compile
+            java_file_path = self._candidate_path(annotated_code, class_name, code_hash)
             result = self._compile_with_openjml(java_file_path)
-            
-            print(f"Annotated code \n {annotated_code}")
-            if result["success"]:
-                # Also save a permanent copy
-                try:
-                    output_dir = Path("output")
-                    output_dir.mkdir(exist_ok=True)
-                    with open(output_dir / f"{class_name}.java", "w") as f:
-                        f.write(annotated_code)
-                except Exception as e:
-                    print(f"Warning: Failed to save permanent copy: {e}")
-                
-                return annotated_code
-            else:
-                error_msg = "\n".join(result["errors"]) if result["errors"] else "Unknown compilation error"
-                raise ValueError(f"JML validation failed: {error_msg}")
+            self._compile_cache[code_hash] = result
+
+        return self._finish_generation(cache_key, annotated_code, class_name, result)
+
+    async def generate_and_validate_async(self, java_code: str, feedback: str = "") -> str:
+        """Async variant of generate_and_validate.
+
+        The blocking LLM call runs in a worker thread and OpenJML through an
+        asyncio subprocess, so concurrent generations don't serialize on
+        either step.
+        """
+        cache_key = self._generation_cache_key(java_code, feedback)
+        if cache_key is not None and cache_key in self._generation_cache:
+            return self._replay_cached_generation(self._generation_cache[cache_key])
+
+        annotated_code = await self.llm.generate_jml_async(java_code, feedback)
+
+        class_name = self._get_code_class_name(annotated_code)
+        if not class_name:
+            raise ValueError("Could not extract class name from the Java code")
+
+        code_hash = hashlib.blake2b(annotated_code.encode()).hexdigest()
+        result = self._compile_cache.get(code_hash)
+        if result is None:
+            java_file_path = self._candidate_path(annotated_code, class_name, code_hash)
+            result = await self._compile_with_openjml_async(java_file_path)
+            self._compile_cache[code_hash] = result
+
+        return self._finish_generation(cache_key, annotated_code, class_name, result)
+
+    def _finish_generation(self, cache_key, annotated_code: str, class_name: str,
+                           result: dict) -> str:
+        """Record the generation outcome in the cache and return or raise."""
+        try:
+            validated = self._handle_compile_result(annotated_code, class_name, result)
+        except ValueError as e:
+            if cache_key is not None:
+                self._generation_cache[cache_key] = ("error", str(e))
+            raise
+        if cache_key is not None:
+            self._generation_cache[cache_key] = ("ok", validated)
+        return validated
+
+    def _handle_compile_result(self, annotated_code: str, class_name: str, result: dict) -> str:
+        """Save validated code or raise with the OpenJML errors."""
+        print(f"Annotated code \n {annotated_code}")
+        if result["success"]:
+            # Also save a permanent copy
+            try:
+                output_dir = Path("output")
+                output_dir.mkdir(exist_ok=True)
+                with open(output_dir / f"{class_name}.java", "w") as f:
+                    f.write(annotated_code)
+            except Exception as e:
+                print(f"Warning: Failed to save permanent copy: {e}")
+
+            return annotated_code
+        else:
+            error_msg = "\n".join(result["errors"]) if result["errors"] else "Unknown compilation error"
+            raise ValueError(f"JML validation failed: {error_msg}")
 
     def _get_code_class_name(self, code: str):
         """Extract the class name from Java code."""
-        # First try to find public class
-        pattern = r'\b(?:public|private|protected)?\s+class\s+(\w+)'
-        match = re.search(pattern, code)
-        
-        if match:
-            return match.group(1)
-        
-        # Try finding any class if there's no public class
-        pattern = r'class\s+(\w+)'
-        match = re.search(pattern, code)
-        
-        if match:
-            return match.group(1)
-            
-        return None
+        # Drop block comments (including JML annotations) first so a "class"
+        # mentioned in prose can't win over the real declaration
+        code = _BLOCK_COMMENT_RE.sub("", code)
+        # Prefer an access-modified class, then fall back to any class
+        match = _CLASS_RE.search(code) or _ANY_CLASS_RE.search(code)
+        return match.group(1) if match else None
@@ -1,8 +1,33 @@
+import asyncio
+import hashlib
+import re
 import subprocess
 import os
 import tempfile
 
+from jvm_tools import SUBPROCESS_OPTS, jvm_command
+
+# Matches whole output lines mentioning an error, in one C-level pass
+_ERROR_LINE_RE = re.compile(r'^.*error.*$', re.MULTILINE | re.IGNORECASE)
+
 class KeYVerifier:
+    def __init__(self):
+        # Proof results keyed by file content hash. Proof search is by far
+        # the most expensive step in the pipeline and is a pure function of
+        # the annotated source, so re-verifying identical content (across
+        # retries or models) replays the stored verdict. The cache is
+        # file-granular rather than per-method: class invariants couple the
+        # proofs of all methods, so a finer split could return stale verdicts.
+        self._proof_cache = {}
+
+    def _content_key(self, file_path: str):
+        """Hash the file contents for the proof cache, or None if unreadable."""
+        try:
+            with open(file_path, "rb") as f:
+                return hashlib.blake2b(f.read()).hexdigest()
+        except OSError:
+            return None
+
     def verify(self, file_path: str) -> dict:
         """
         Verify Java file with JML annotations using KeY prover.
@@ -19,19 +44,27 @@ class KeYVerifier:
                 "success": False,
                 "errors": [f"File not found: {file_path}"]
             }
-        
+
+        cache_key = self._content_key(file_path)
+        if cache_key is not None and cache_key in self._proof_cache:
+            return self._proof_cache[cache_key]
+
         try:
             result = subprocess.run(
-                ["key", "--prove", file_path],
+                jvm_command("key", "--prove", file_path),
                 capture_output=True,
                 text=True,
-                timeout=60  # Add timeout to prevent indefinite hanging
+                timeout=60,  # Add timeout to prevent indefinite hanging
+                **SUBPROCESS_OPTS
             )
-            
-            return {
+
+            verdict = {
                 "success": "Proof completed" in result.stdout,
                 "errors": self._parse_key_errors(result.stdout)
             }
+            if cache_key is not None:
+                self._proof_cache[cache_key] = verdict
+            return verdict
         except subprocess.TimeoutExpired:
             return {
                 "success": False,
@@ -43,12 +76,61 @@ class KeYVerifier:
                 "errors": [f"KeY verification error: {str(e)}"]
             }
 
+    async def verify_async(self, file_path: str) -> dict:
+        """
+        Async variant of verify using an asyncio subprocess.
+
+        Args:
+            file_path: Path to the Java file
+
+        Returns:
+            Dictionary with verification results
+        """
+        if not os.path.exists(file_path):
+            return {
+                "success": False,
+                "errors": [f"File not found: {file_path}"]
+            }
+
+        cache_key = self._content_key(file_path)
+        if cache_key is not None and cache_key in self._proof_cache:
+            return self._proof_cache[cache_key]
+
+        try:
+            proc = await asyncio.create_subprocess_exec(
+                *jvm_command("key", "--prove", file_path),
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                **SUBPROCESS_OPTS
+            )
+            try:
+                stdout, _ = await asyncio.wait_for(proc.communicate(), timeout=60)
+            except asyncio.TimeoutError:
+                proc.kill()
+                return {
+                    "success": False,
+                    "errors": ["KeY verification timed out"]
+                }
+            except asyncio.CancelledError:
+                # A caller's wait_for cancelled us mid-proof; kill the JVM
+                # rather than leaving it running past the wall-time cap
+                proc.kill()
+                raise
+
+            output = stdout.decode()
+            verdict = {
+                "success": "Proof completed" in output,
+                "errors": self._parse_key_errors(output)
+            }
+            if cache_key is not None:
+                self._proof_cache[cache_key] = verdict
+            return verdict
+        except Exception as e:
+            return {
+                "success": False,
+                "errors": [f"KeY verification error: {str(e)}"]
+            }
+
     def _parse_key_errors(self, output: str) -> list:
         """Extract error messages from KeY output."""
-        errors = []
-        
-        for line in output.split("\n"):
-            if "ERROR" in line or "error" in line.lower():
-                errors.append(line.strip())
-                
-        return errors
+        return [line.strip() for line in _ERROR_LINE_RE.findall(output)]
@@ -1,7 +1,28 @@
+import asyncio
+import atexit
+import hashlib
+import shutil
 import subprocess
 import os
 import tempfile
 import re
+import xml.etree.ElementTree as ET
+
+from jvm_tools import SUBPROCESS_OPTS, await_file, jvm_command
+
+# Compiled classes go into a scratch dir (typically tmpfs) instead of
+# landing next to the sources, so repeated attempts don't churn .class
+# files through the working tree. Each source gets its own subdirectory
+# (keyed by its path) so concurrent analyses of same-named classes from
+# different files never overwrite each other's output
+_CLASS_DIR = tempfile.mkdtemp(prefix="spotbugs_classes_")
+atexit.register(shutil.rmtree, _CLASS_DIR, ignore_errors=True)
+
+# Matches whole output lines mentioning an error, in one C-level pass
+_ERROR_LINE_RE = re.compile(r'^.*error.*$', re.MULTILINE | re.IGNORECASE)
+# Specific SpotBugs bug report lines, anchored so an "M " inside a message
+# body can't produce a spurious match
+_BUG_RE = re.compile(r'^M\s+([A-Z_]+):\s+(.*)', re.MULTILINE)
 
 class SpotBugsAnalyzer:
     def run(self, file_path: str) -> list:
@@ -21,49 +42,145 @@ class SpotBugsAnalyzer:
         # Need to compile the Java file first
         try:
             compile_result = subprocess.run(
-                ["javac", file_path],
+                jvm_command("javac", "-d", self._output_dir_for(file_path), file_path),
                 capture_output=True,
-                text=True
+                text=True,
+                **SUBPROCESS_OPTS
             )
-            
+
             if compile_result.returncode != 0:
                 return [f"Compilation failed: {compile_result.stderr}"]
-            
-            # Get the class file path (same as java file but with .class extension)
-            class_file = os.path.splitext(file_path)[0] + ".class"
-            if not os.path.exists(class_file):
+
+            class_file = self._class_file_for(file_path)
+            if not await_file(class_file):
                 return ["Compilation completed but class file not found"]
-            
-            # Run SpotBugs on the class file
+
+            # Run SpotBugs on the class file, writing a structured XML report.
+            # Any report left from a previous attempt at the same path is
+            # removed first so a run that fails to write one can't have the
+            # stale findings misattributed to the new code
+            xml_path = self._report_path(class_file)
+            self._remove_stale_report(xml_path)
             result = subprocess.run(
-                ["spotbugs", "-textui", class_file],
+                jvm_command("spotbugs", "-textui", "-xml:withMessages",
+                            "-output", xml_path, class_file),
                 capture_output=True,
-                text=True
+                text=True,
+                **SUBPROCESS_OPTS
             )
-            
+
             print(f"Output of SpotBugs - \n {result.stdout}")
+
+            return self._collect_errors(xml_path, result.stdout, result.stderr)
             
-            return self._parse_errors(result.stdout + result.stderr)
-            
         except Exception as e:
             return [f"Error running SpotBugs: {str(e)}"]
 
+    async def run_async(self, file_path: str) -> list:
+        """
+        Async variant of run using asyncio subprocesses.
+
+        Args:
+            file_path: Path to Java file
+
+        Returns:
+            List of found errors
+        """
+        if not os.path.exists(file_path):
+            return [f"File not found: {file_path}"]
+
+        try:
+            returncode, _, stderr = await self._exec(
+                *jvm_command("javac", "-d", self._output_dir_for(file_path), file_path))
+            if returncode != 0:
+                return [f"Compilation failed: {stderr}"]
+
+            class_file = self._class_file_for(file_path)
+            if not await asyncio.to_thread(await_file, class_file):
+                return ["Compilation completed but class file not found"]
+
+            xml_path = self._report_path(class_file)
+            self._remove_stale_report(xml_path)
+            _, stdout, stderr = await self._exec(
+                *jvm_command("spotbugs", "-textui", "-xml:withMessages",
+                             "-output", xml_path, class_file))
+
+            print(f"Output of SpotBugs - \n {stdout}")
+
+            return self._collect_errors(xml_path, stdout, stderr)
+
+        except Exception as e:
+            return [f"Error running SpotBugs: {str(e)}"]
+
+    def _output_dir_for(self, file_path: str) -> str:
+        """Return (and create) the per-source compile output directory."""
+        key = hashlib.blake2b(os.path.abspath(file_path).encode()).hexdigest()[:16]
+        out_dir = os.path.join(_CLASS_DIR, key)
+        os.makedirs(out_dir, exist_ok=True)
+        return out_dir
+
+    def _class_file_for(self, file_path: str) -> str:
+        """Return the scratch-dir path of the class compiled from a Java file."""
+        stem = os.path.splitext(os.path.basename(file_path))[0]
+        return os.path.join(self._output_dir_for(file_path), f"{stem}.class")
+
+    def _report_path(self, class_file: str) -> str:
+        """Return the scratch-dir path for the XML report of a class file."""
+        return os.path.splitext(class_file)[0] + ".xml"
+
+    def _remove_stale_report(self, xml_path: str):
+        """Delete a leftover XML report from an earlier attempt, if any."""
+        try:
+            os.remove(xml_path)
+        except FileNotFoundError:
+            pass
+
+    def _collect_errors(self, xml_path: str, stdout: str, stderr: str) -> list:
+        """Combine the XML bug report with any error lines from the streams."""
+        if os.path.exists(xml_path):
+            errors = self._parse_xml_report(xml_path)
+            errors.extend(line.strip() for line in _ERROR_LINE_RE.findall(stderr))
+            return errors
+        # No report was produced (e.g. the tool build lacks XML support);
+        # fall back to scraping the text output
+        return self._parse_errors(stdout + stderr)
+
+    def _parse_xml_report(self, xml_path: str) -> list:
+        """Stream-parse BugInstance elements out of a SpotBugs XML report."""
+        errors = []
+        try:
+            for _, element in ET.iterparse(xml_path, events=("end",)):
+                if element.tag == "BugInstance":
+                    message = element.findtext("LongMessage") or ""
+                    errors.append(
+                        f"SpotBugs found issue: {element.get('type')} - {message}")
+                    element.clear()
+        except ET.ParseError as e:
+            errors.append(f"Failed to parse SpotBugs XML report: {e}")
+        return errors
+
+    async def _exec(self, *command) -> tuple:
+        """Run a command in an asyncio subprocess and decode its output."""
+        proc = await asyncio.create_subprocess_exec(
+            *command,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            **SUBPROCESS_OPTS
+        )
+        try:
+            stdout, stderr = await proc.communicate()
+        except asyncio.CancelledError:
+            # A caller's wait_for timed out; take the JVM down with the
+            # task instead of leaving it burning CPU in the background
+            proc.kill()
+            raise
+        return proc.returncode, stdout.decode(), stderr.decode()
+
     def _parse_errors(self, output: str) -> list:
         """Parse errors from SpotBugs output."""
-        errors = []
-        
-        # Look for specific SpotBugs error patterns
-        bug_pattern = r'M\s+([A-Z_]+):\s+(.*)'
-        
-        for line in output.split("\n"):
-            if "ERROR" in line or "error" in line.lower():
-                errors.append(line.strip())
-            
-            # Look for bug patterns
-            match = re.search(bug_pattern, line)
-            if match:
-                bug_type = match.group(1)
-                description = match.group(2)
-                errors.append(f"SpotBugs found issue: {bug_type} - {description}")
-                
+        errors = [line.strip() for line in _ERROR_LINE_RE.findall(output)]
+        errors.extend(
+            f"SpotBugs found issue: {bug_type} - {description}"
+            for bug_type, description in _BUG_RE.findall(output)
+        )
         return errors
@@ -0,0 +1,162 @@
+from JMLGenerator import JMLGenerator
+from KeYVerifier import KeYVerifier
+from llm_interface import LLMInterface
+from ollama_client import OllamaClient
+from SpotBugsAnalyzer import SpotBugsAnalyzer
+from jvm_tools import await_file
+from concurrent.futures import ThreadPoolExecutor
+import atexit
+import hashlib
+import os
+import shutil
+import tempfile
+
+class VerificationSystem:
+    def __init__(self, llm: LLMInterface, max_retries: int = 7, max_stalls: int = 2):
+        self.generator = JMLGenerator(llm)
+        self.spotbugs = SpotBugsAnalyzer()
+        self.key = KeYVerifier()
+        self.max_retries = max_retries
+        # Consecutive attempts with identical feedback tolerated before the
+        # loop is declared stuck and aborted early
+        self.max_stalls = max_stalls
+        # Verification verdicts keyed by annotated-code hash; when the LLM
+        # returns the same code again, the cached verdict is reused instead
+        # of re-running SpotBugs and KeY on identical input
+        self._verdict_cache = {}
+        # Candidate files live in one scratch directory instead of the CWD,
+        # so concurrent verifications can't collide on the same file name
+        self._workdir = tempfile.mkdtemp(prefix="verif_")
+        atexit.register(shutil.rmtree, self._workdir, ignore_errors=True)
+
+    def run(self, initial_code: str):
+        feedback = ""
+        prev_feedback_hash = None
+        stalls = 0
+
+        # Extract class name for file naming; the per-input subdirectory is
+        # keyed by content hash so batch workers verifying different programs
+        # with the same class name never share a file
+        class_name = self.generator._get_code_class_name(initial_code) or "Temp"
+        case_dir = os.path.join(
+            self._workdir, hashlib.blake2b(initial_code.encode()).hexdigest()[:16])
+        os.makedirs(case_dir, exist_ok=True)
+        java_file_path = os.path.join(case_dir, f"{class_name}.java")
+
+        current_code = initial_code
+        # Stall-recovery sampling override, passed per request rather than
+        # written to the shared client: batch workers run concurrently and
+        # a client-level bump would leak into their generations (and, once
+        # above zero, disable every deterministic cache in the stack)
+        temperature = None
+
+        for attempt in range(self.max_retries):
+            print(f"Attempt {attempt+1}/{self.max_retries}")
+            
+            try:
+                # Generate and validate annotations
+                annotated_code = self.generator.generate_and_validate(
+                    current_code, feedback, temperature=temperature)
+                
+                # Write to a temp file and rename into place so the analyzers
+                # can never observe a partially written candidate
+                self._write_atomic(java_file_path, annotated_code)
+                await_file(java_file_path)
+                
+                code_hash = hashlib.blake2b(annotated_code.encode()).hexdigest()
+                if code_hash in self._verdict_cache:
+                    # The LLM stalled on the same output; replay the stored
+                    # verdict and sample a bit hotter to break the loop
+                    print("♻️ Identical code to a previous attempt, reusing verdict")
+                    spotbugs_errors, key_result = self._verdict_cache[code_hash]
+                    # Sample hotter on the next attempt; the additive floor
+                    # matters at the deterministic default, where a purely
+                    # multiplicative bump of 0 would change nothing
+                    if temperature is None:
+                        temperature = getattr(self.generator.llm, "temperature", None) or 0
+                    temperature = max(temperature * 1.2, temperature + 0.1)
+                else:
+                    # Run SpotBugs and KeY in parallel; both are independent
+                    # subprocess-bound analyses of the same file, so an attempt
+                    # costs max(spotbugs, key) instead of the sum
+                    with ThreadPoolExecutor(max_workers=2) as executor:
+                        spotbugs_future = executor.submit(self.spotbugs.run, java_file_path)
+                        key_future = executor.submit(self.key.verify, java_file_path)
+                        spotbugs_errors = spotbugs_future.result()
+                        key_result = key_future.result()
+                    self._verdict_cache[code_hash] = (spotbugs_errors, key_result)
+                
+                # Check if successful
+                if not spotbugs_errors and key_result["success"]:
+                    print("✅ Verification successful!")
+                    return annotated_code
+                
+                # Generate feedback for next attempt
+                feedback = "Issues found:\n"
+                if spotbugs_errors:
+                    feedback += "- SpotBugs errors:\n" + "\n".join(spotbugs_errors) + "\n"
+                if not key_result["success"]:
+                    feedback += "- KeY errors:\n" + "\n".join(key_result["errors"]) + "\n"
+                
+                print(feedback)
+                current_code = annotated_code
+
+                # Identical feedback means the last retry fixed nothing;
+                # after max_stalls such rounds further retries won't
+                # converge either, so stop paying for them
+                feedback_hash = hashlib.blake2b(feedback.encode()).hexdigest()
+                if feedback_hash == prev_feedback_hash:
+                    stalls += 1
+                    if stalls >= self.max_stalls:
+                        print("❌ No progress across retries — aborting early.")
+                        return current_code
+                else:
+                    stalls = 0
+                    prev_feedback_hash = feedback_hash
+                
+            except ValueError as e:
+                feedback = f"JML compilation failed: {str(e)}"
+                print(feedback)
+            
+            except Exception as e:
+                print(f"Unexpected error: {str(e)}")
+                
+        print("❌ Verification failed after max retries.")
+        return current_code  # Return the last attempt
+
+    def run_batch(self, codes: list) -> list:
+        """
+        Verify many programs concurrently.
+
+        Each worker drives its own retry loop; the LLM requests overlap so
+        the model stays resident and the shared prompt prefix is prefilled
+        once, while the per-input workdirs keep the file paths disjoint.
+        Results keep the input order.
+        """
+        if not codes:
+            return []
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            return list(executor.map(self.run, codes))
+
+    def _write_atomic(self, path: str, content: str):
+        """Write content to path atomically (temp file + rename)."""
+        tmp_path = os.path.join(os.path.dirname(path), f".{os.path.basename(path)}.tmp")
+        with open(tmp_path, "w") as f:
+            f.write(content)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+
+# Example usage
+if __name__ == "__main__":
+    llm = OllamaClient(model="qwen2.5-coder:1.5b")
+    system = VerificationSystem(llm)
+    java_code = """
+    public class Calculator {
+        public int add(int a, int b) {
+            return a + b;
+        }
+    }
+    """
+    system.run(java_code)
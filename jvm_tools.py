@@ -0,0 +1,110 @@
+"""
+Helpers for launching the Java-based verification tools.
+
+JVM startup (classloading plus JIT warmup) dominates the cost of every
+openjml/javac/spotbugs/key invocation. When a Nailgun client (`ng`) is on
+PATH and a server is running with the tools on its classpath, invocations
+are routed through it so all calls share one warm JVM. Without Nailgun the
+plain tool commands are used unchanged.
+"""
+
+import atexit
+import os
+import shutil
+import subprocess
+import threading
+import time
+from functools import lru_cache
+
+# Passed to every tool subprocess. With posix_spawn on Linux, skipping
+# CPython's close-fds sweep avoids a linear scan up to RLIMIT_NOFILE per
+# launch, which is noticeable on servers with a high nofile limit.
+SUBPROCESS_OPTS = {"close_fds": False}
+
+# Main classes served by the Nailgun JVM for each CLI tool
+NAILGUN_MAIN_CLASSES = {
+    "openjml": "org.jmlspecs.openjml.Main",
+    "javac": "com.sun.tools.javac.Main",
+    "spotbugs": "edu.umd.cs.findbugs.LaunchAppropriateUI",
+    "key": "de.uka.ilkd.key.core.Main",
+}
+
+_ng_bin = shutil.which("ng")
+_ng_server_bin = shutil.which("ng-server")
+
+# Background Nailgun server started on first routed call; one warm JVM then
+# serves every javac/spotbugs/openjml/key invocation in the process
+_server_proc = None
+_server_lock = threading.Lock()
+
+
+def _shutdown_server():
+    if _server_proc is not None and _server_proc.poll() is None:
+        _server_proc.terminate()
+
+
+def _ensure_server():
+    """Start the Nailgun server once, in the background.
+
+    The server script is expected to carry the verification tools on its
+    classpath. If another server already owns the port, the extra process
+    exits immediately and the clients connect to the existing one.
+    """
+    global _server_proc
+    with _server_lock:
+        if _server_proc is None:
+            _server_proc = subprocess.Popen(
+                [_ng_server_bin],
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                **SUBPROCESS_OPTS
+            )
+            atexit.register(_shutdown_server)
+
+
+@lru_cache(maxsize=None)
+def _resolve(tool: str) -> str:
+    """Resolve a tool to its absolute path once, skipping PATH walks per call."""
+    return shutil.which(tool) or tool
+
+
+def await_file(path: str, tries: int = 5, base: float = 0.05) -> bool:
+    """
+    Wait briefly for a file to become visible, with exponential backoff.
+
+    On networked filesystems a file written by one process (or a javac
+    child) can lag behind the write by a few tens of milliseconds; a short
+    bounded wait absorbs that instead of failing the whole verification
+    attempt and burning an LLM round-trip.
+
+    Args:
+        path: File path to wait for
+        tries: Maximum number of existence checks
+        base: Initial sleep in seconds, doubled after each miss
+
+    Returns:
+        True when the file exists, False after all tries are exhausted
+    """
+    for i in range(tries):
+        if os.path.exists(path):
+            return True
+        time.sleep(base * (2 ** i))
+    return os.path.exists(path)
+
+
+def jvm_command(tool: str, *args: str) -> list:
+    """
+    Build the argv for a JVM tool invocation.
+
+    Args:
+        tool: Name of the CLI tool (e.g. "openjml", "spotbugs")
+        *args: Arguments to pass to the tool
+
+    Returns:
+        Command list routed through Nailgun when available, else the plain command
+    """
+    if _ng_bin and tool in NAILGUN_MAIN_CLASSES:
+        if _ng_server_bin:
+            _ensure_server()
+        return [_ng_bin, NAILGUN_MAIN_CLASSES[tool], *args]
+    return [_resolve(tool), *args]
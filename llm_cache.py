@@ -0,0 +1,68 @@
+import hashlib
+import os
+
+from llm_interface import LLMInterface
+
+class CachedLLM(LLMInterface):
+    """
+    Disk-backed response cache wrapped around another LLM client.
+
+    Identical (model, prompt, temperature) requests are served from disk
+    instead of re-running inference, which makes retry-heavy evaluation runs
+    and repeated invocations nearly free. Responses are only stored when the
+    wrapped client samples deterministically (temperature == 0), since cached
+    replies would otherwise change the sampling behavior.
+    """
+
+    def __init__(self, llm: LLMInterface, cache_dir: str = ".llm_cache"):
+        self.llm = llm
+        self.cache_dir = cache_dir
+        os.makedirs(cache_dir, exist_ok=True)
+
+    # The wrapper is expected to look like the client it wraps: callers such
+    # as JMLGenerator read (and the stall recovery writes) temperature on
+    # whatever client they were handed, so proxy it through
+    @property
+    def temperature(self):
+        return getattr(self.llm, "temperature", None)
+
+    @temperature.setter
+    def temperature(self, value):
+        self.llm.temperature = value
+
+    @property
+    def model(self):
+        return getattr(self.llm, "model", "")
+
+    def generate_jml(self, java_code: str, feedback: str = "",
+                     temperature: float = None) -> str:
+        """Generate JML annotations, serving repeated requests from the cache."""
+        cache_path = self._cache_path(java_code, feedback, temperature)
+
+        if cache_path and os.path.exists(cache_path):
+            with open(cache_path, "r") as f:
+                return f.read()
+
+        if temperature is None:
+            response = self.llm.generate_jml(java_code, feedback)
+        else:
+            response = self.llm.generate_jml(java_code, feedback, temperature=temperature)
+
+        if cache_path:
+            with open(cache_path, "w") as f:
+                f.write(response)
+
+        return response
+
+    def _cache_path(self, java_code: str, feedback: str, temperature: float = None):
+        """Return the cache file path for a request, or None when uncacheable."""
+        if temperature is None:
+            temperature = getattr(self.llm, "temperature", None)
+        if temperature is None or temperature > 0:
+            return None
+
+        model = getattr(self.llm, "model", "")
+        key = hashlib.sha256(
+            f"{model}\x00{temperature}\x00{java_code}\x00{feedback}".encode()
+        ).hexdigest()
+        return os.path.join(self.cache_dir, f"{key}.java")
@@ -1,6 +1,24 @@
+import asyncio
 from abc import ABC, abstractmethod
+from typing import List, Tuple
 
 class LLMInterface(ABC):
     @abstractmethod
     def generate_jml(self, java_code: str, feedback: str = "") -> str:
-        pass
\ No newline at end of file
+        pass
+
+    async def generate_jml_async(self, java_code: str, feedback: str = "") -> str:
+        """Async counterpart of generate_jml.
+
+        The default runs the sync call in a worker thread so awaiting several
+        generations overlaps their round-trips.
+        """
+        return await asyncio.to_thread(self.generate_jml, java_code, feedback)
+
+    def generate_jml_batch(self, requests: List[Tuple[str, str]]) -> List[str]:
+        """Generate JML annotations for a batch of (java_code, feedback) pairs.
+
+        The default implementation is sequential; clients whose backend can
+        serve requests in parallel should override this.
+        """
+        return [self.generate_jml(code, feedback) for code, feedback in requests]
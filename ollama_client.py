@@ -1,46 +1,231 @@
+import asyncio
+import hashlib
+import io
+import json
+import os
+import re
+import sqlite3
+import threading
 import requests
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; stdlib json works everywhere
+    orjson = None
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Tuple
+
 from llm_interface import LLMInterface
 
+# Extracts the code out of a ```java fenced block in one scan. The closing
+# fence is optional: num_predict truncation can cut a response off before
+# the fence, and the code itself is still worth keeping
+_FENCE_RE = re.compile(r"```java\s*\n(.*?)(?:```|\Z)", re.DOTALL)
+
+# Bound once: the stream parser runs per decoded token chunk, and orjson's
+# C parser is several times faster than stdlib json on those small payloads
+_json_loads = json.loads if orjson is None else orjson.loads
+
 class OllamaClient(LLMInterface):
-    def __init__(self, 
-                 model: str = "codellama:7b", 
+    def __init__(self,
+                 model: str = "qwen2.5-coder:1.5b-instruct-q4_k_m",
                  base_url: str = "http://localhost:11434",
-                 temperature: float = 0.7):
+                 temperature: float = 0.1,
+                 keep_alive: str = "10m",
+                 cache_path: str = ".ollama_cache.sqlite",
+                 use_cache: bool = True,
+                 warmup: bool = True):
         self.model = model
         self.base_url = base_url
         self.temperature = temperature
+        # Keep the model (and its prompt-prefix KV cache) resident between
+        # requests so retries don't pay the load/prefill cost again
+        self.keep_alive = keep_alive
+        # One keep-alive session per client so repeated calls reuse the TCP
+        # connection instead of re-handshaking; the adapter sizes the pool
+        # for batch fan-out and transparently retries transient 5xx replies
+        # that a busy Ollama server can return
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=2,
+            pool_maxsize=4,
+            max_retries=Retry(total=3, backoff_factor=0.5,
+                              status_forcelist=(502, 503, 504))
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        # Sqlite-backed response cache shared across processes; only consulted
+        # when the client samples deterministically (temperature == 0)
+        self._cache_lock = threading.Lock()
+        self._cache = None
+        if use_cache:
+            try:
+                self._cache = sqlite3.connect(cache_path, check_same_thread=False)
+                self._cache.execute("PRAGMA journal_mode=WAL")
+                self._cache.execute(
+                    "CREATE TABLE IF NOT EXISTS responses "
+                    "(key TEXT PRIMARY KEY, response TEXT)")
+                self._cache.commit()
+            except sqlite3.Error as e:
+                print(f"Warning: Failed to open response cache: {e}")
+                self._cache = None
+        # Load the model in the background so the first real generation
+        # doesn't pay the multi-second load on its critical path
+        if warmup:
+            threading.Thread(target=self._warmup, daemon=True).start()
+
+    def _warmup(self):
+        """Ask the server to load the model; an empty prompt generates nothing."""
+        try:
+            self.session.post(
+                f"{self.base_url}/api/generate",
+                json={"model": self.model, "prompt": "", "keep_alive": "30m"},
+                timeout=120
+            )
+        except requests.exceptions.RequestException:
+            pass  # the first real call will surface any connectivity problem
+
+    def __del__(self):
+        try:
+            self.session.close()
+        except Exception:
+            pass
+
+    def _cache_key(self, prompt: str, temperature: float):
+        """Return the response cache key for a prompt, or None when uncacheable."""
+        if self._cache is None or temperature is None or temperature > 0:
+            return None
+        return hashlib.blake2b(
+            f"{self.model}|{temperature}|{prompt}".encode()).hexdigest()
 
-    def generate_jml(self, java_code: str, feedback: str = "") -> str:
-        """Generate JML annotations for the given Java code."""
-        prompt = self._build_prompt(java_code, feedback)
-        
+    def _cache_get(self, key: str):
+        with self._cache_lock:
+            row = self._cache.execute(
+                "SELECT response FROM responses WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _cache_put(self, key: str, response: str):
+        with self._cache_lock:
+            self._cache.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?)", (key, response))
+            self._cache.commit()
+
+    def generate_jml(self, java_code: str, feedback: str = "", no_cache: bool = False,
+                     temperature: float = None) -> str:
+        """Generate JML annotations for the given Java code.
+
+        A per-call temperature overrides the client default without touching
+        shared state, so callers (e.g. stall recovery) can sample hotter for
+        one request while concurrent users keep their settings.
+        """
+        if temperature is None:
+            temperature = self.temperature
+        system_prompt, user_prompt = self._build_prompt(java_code, feedback)
+
+        cache_key = None if no_cache else self._cache_key(
+            f"{system_prompt}\x00{user_prompt}", temperature)
+        if cache_key is not None:
+            cached = self._cache_get(cache_key)
+            if cached is not None:
+                return cached
+
+        # Sending the instructions through the system field keeps them a
+        # byte-identical prefix across every request, which is what Ollama's
+        # prompt cache matches on; num_ctx is pinned so the server never
+        # reallocates the context buffer between calls
+        payload = {
+            "model": self.model,
+            "system": system_prompt,
+            "prompt": user_prompt,
+            "stream": True,
+            "keep_alive": self.keep_alive,
+            "options": {
+                "temperature": temperature,
+                "num_ctx": 4096,
+                # Saturate the host CPU during prefill; together with the
+                # int4-quantized default model (half the weight bandwidth of
+                # fp16, minimal quality loss on structured output like JML)
+                # this roughly doubles tokens/s on CPU-only hosts
+                "num_thread": os.cpu_count(),
+                "num_batch": 512,
+                # JML generation is a structured rewrite, not open-ended
+                # prose: near-greedy sampling plus a hard token budget keeps
+                # generations short and on-format. No fence-based stop
+                # sequence — Ollama truncates the response *before* the stop
+                # string, which would eat the closing fence itself
+                "top_p": 0.9,
+                "top_k": 40,
+                "num_predict": 512,
+                "stop": ["</s>"]
+            }
+        }
         try:
-            response = requests.post(
+            response = self.session.post(
                 f"{self.base_url}/api/generate",
-                json={
-                    "model": self.model,
-                    "prompt": prompt,
-                    "stream": False,
-                    "options": {"temperature": self.temperature}
-                }
-               # ,timeout=60  # Add timeout to prevent hanging
+                json=payload,
+                stream=True,
+                timeout=120  # Add timeout to prevent hanging
             )
             response.raise_for_status()
-            annotated_code = response.json().get("response", "")
-            
+
+            # Stream the tokens as they decode, draining to the final done
+            # chunk. Prompt-prefix KV reuse is the server's job: Ollama
+            # matches the byte-identical system/code prefix on its own, so
+            # no context tokens are resent from the client.
+            buffer = io.StringIO()
+            for line in response.iter_lines():
+                if not line:
+                    continue
+                data = _json_loads(line)
+                chunk = data.get("response", "")
+                if chunk:
+                    buffer.write(chunk)
+                if data.get("done"):
+                    break
+            annotated_code = buffer.getvalue()
+
             # Extract just the Java code if the model wrapped it in markdown
-            if "```java" in annotated_code and "```" in annotated_code:
-                start = annotated_code.find("```java") + 7
-                end = annotated_code.rfind("```")
-                annotated_code = annotated_code[start:end].strip()
-                
+            match = _FENCE_RE.search(annotated_code)
+            annotated_code = match.group(1).strip() if match else annotated_code.strip()
+
+            if cache_key is not None:
+                self._cache_put(cache_key, annotated_code)
+
             return annotated_code
             
         except requests.exceptions.RequestException as e:
             raise ConnectionError(f"Ollama connection failed: {str(e)}")
 
-    def _build_prompt(self, java_code: str, feedback: str = "") -> str:
-        """Build the prompt for the LLM to generate JML annotations."""
+    async def generate_jml_async(self, java_code: str, feedback: str = "") -> str:
+        """Async variant of generate_jml.
+
+        The requests-based HTTP call runs in a worker thread, so multiple
+        generations awaited together keep the Ollama server's parallel
+        decode slots busy without blocking the event loop.
+        """
+        return await asyncio.to_thread(self.generate_jml, java_code, feedback)
+
+    def generate_jml_batch(self, requests_batch: List[Tuple[str, str]]) -> List[str]:
+        """Generate JML annotations for many (java_code, feedback) pairs at once.
+
+        Ollama has no server-side batch endpoint, so the requests are issued
+        concurrently client-side; the server interleaves decoding when
+        OLLAMA_NUM_PARALLEL allows it. Results keep the input order.
+        """
+        if not requests_batch:
+            return []
+
+        with ThreadPoolExecutor(max_workers=min(len(requests_batch), 8)) as pool:
+            futures = [
+                pool.submit(self.generate_jml, code, feedback)
+                for code, feedback in requests_batch
+            ]
+            return [future.result() for future in futures]
+
+    def _build_prompt(self, java_code: str, feedback: str = "") -> Tuple[str, str]:
+        """Build the (system, user) prompt pair for JML annotation generation."""
        # Example of well-annotated code
         sample_code = """
 // It establishes that the sum is always non-negative and within the range of Integer
@@ -58,38 +243,41 @@ public class Calculator {
 }
 """
 
-        # Create the prompt with feedback if provided
-        prompt = f"""
-        You are a Java Modeling Language (JML) expert. Generate correct JML annotations 
+        # The instructions and example never vary, so they form the system
+        # prompt; the per-request code and feedback go in the user prompt
+        system_prompt = f"""
+        You are a Java Modeling Language (JML) expert. Generate correct JML annotations
         for the following Java code following these rules:
-        
+
         1. Use requires/ensures clauses for method contracts
         2. Define class invariants where needed
         3. Handle nullability and exceptions properly
         4. Use JML keywords correctly (e.g., signals, assignable)
         5. Validate data ranges with invariant clauses
         6. Do not use comments inside annotations
-        
+
         Return ONLY the Java code with JML annotations in Java comment format without explanations.
         Return ONLY result code without any Markdown syntax.
-        
+
         Example of code with JML annotations:
         {sample_code}
         """
-        
+
+        # Feedback goes last so the stable prefix (system prompt + code)
+        # stays identical across retries and the server's prefix cache can
+        # reuse it
+        user_prompt = f"""
+        Java Code to annotate:
+        {java_code}
+        """
+
         # Add feedback if available
         if feedback:
-            prompt += f"""
+            user_prompt += f"""
         Previous attempt had these issues:
         {feedback}
-        
+
         Please address these issues in your new annotations.
         """
-            
-        # Add the code to annotate
-        prompt += f"""
-        Java Code to annotate:
-        {java_code}
-        """
-        
-        return prompt
+
+        return system_prompt, user_prompt